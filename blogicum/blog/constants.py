@@ -2,3 +2,7 @@ MAX_LENGTH_POST = 256
 MAX_LENGTH_PROFILE = 256
 
 NUMBER_OF_POSTS = 10
+
+INDEX_CACHE_TTL = 60
+
+POST_PREVIEW_LENGTH = 200
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-08-30 00:32
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    counts = Post.objects.annotate(real_count=Count('comment'))
+    for post in counts.exclude(real_count=0):
+        Post.objects.filter(pk=post.pk).update(comment_count=post.real_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_alter_comment_author_alter_comment_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(
+            fill_comment_count, migrations.RunPython.noop
+        ),
+    ]
@@ -44,6 +44,9 @@ class Category(BaseModel):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=['is_published'], name='category_pub_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -102,11 +105,23 @@ class Post(BaseModel):
         blank=True,
         null=True
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['is_published', '-pub_date'],
+                name='post_pub_idx',
+                condition=models.Q(is_published=True),
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -152,3 +167,9 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx',
+            ),
+        ]
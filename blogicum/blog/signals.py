@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Post
+
+INDEX_CACHE_VERSION_KEY = 'blog:index:version'
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """Увеличивает счётчик комментариев поста при создании комментария."""
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_index_cache_version(sender, **kwargs):
+    """Сбрасывает кеш главной страницы при изменении постов/комментариев."""
+    try:
+        cache.incr(INDEX_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_CACHE_VERSION_KEY, 1, None)
@@ -20,7 +20,7 @@ urlpatterns = [
     path('posts/<int:post_id>/delete_comment/<int:comment_id>/',
          views.CommentDeleteView.as_view(), name='delete_comment'),
     path('category/<slug:category_slug>/',
-         views.category_posts,
+         views.CategoryListView.as_view(),
          name='category_posts'),
     path('profile/edit_profile/',
          views.ProfileUpdateView.as_view(), name='edit_profile'),
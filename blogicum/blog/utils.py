@@ -1,10 +1,53 @@
 from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 
-from .constants import NUMBER_OF_POSTS
 
+class PKPaginator(Paginator):
+    """
+    Пагинатор, собирающий страницу в два шага: сначала выбираются только
+    первичные ключи нужной страницы, затем полные строки по `pk__in`.
+    На глубоких страницах это избавляет БД от чтения широких строк
+    (text, image), попадающих под OFFSET.
+    """
 
-def paginate_page(request, post_list, post_per_page=NUMBER_OF_POSTS):
-    paginator = Paginator(post_list, post_per_page)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    return page_obj
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        object_list = self.object_list
+        if not hasattr(object_list, 'values_list'):
+            return super().page(number)
+        pks = list(object_list.values_list('pk', flat=True)[bottom:top])
+        order = {pk: index for index, pk in enumerate(pks)}
+        page_objects = sorted(
+            object_list.filter(pk__in=pks).iterator(chunk_size=self.per_page),
+            key=lambda obj: order[obj.pk],
+        )
+        return self._get_page(page_objects, number, self)
+
+
+class EstimatedPaginator(PKPaginator):
+    """
+    Пагинатор, заменяющий точный COUNT(*) оценкой планировщика PostgreSQL
+    (pg_class.reltuples): на больших таблицах точный подсчёт — это
+    последовательное сканирование на каждый запрос списка. На других СУБД
+    и для пустой оценки выполняется обычный точный подсчёт.
+    """
+
+    @cached_property
+    def count(self):
+        if connection.vendor != 'postgresql':
+            return super().count
+        model = getattr(self.object_list, 'model', None)
+        if model is None:
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] and row[0] > 0:
+            return int(row[0])
+        return super().count
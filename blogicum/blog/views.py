@@ -1,9 +1,13 @@
+import hashlib
+
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
-from django.db.models import Count
-from django.http import HttpResponseNotFound
-from django.shortcuts import get_object_or_404, render, redirect
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch, Q
+from django.db.models.functions import Substr
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.urls import reverse, reverse_lazy
 from django.views.generic import (
@@ -12,8 +16,9 @@ from django.views.generic import (
 
 from .forms import PostForm, CommentForm
 from .models import Post, Category, Comment
-from .constants import NUMBER_OF_POSTS
-from .utils import paginate_page
+from .constants import INDEX_CACHE_TTL, NUMBER_OF_POSTS, POST_PREVIEW_LENGTH
+from .signals import INDEX_CACHE_VERSION_KEY
+from .utils import EstimatedPaginator, PKPaginator
 
 
 class OnlyAuthorMixin(LoginRequiredMixin):
@@ -24,86 +29,157 @@ class OnlyAuthorMixin(LoginRequiredMixin):
     """
 
     def dispatch(self, request, *args, **kwargs):
-        if request.user != self.get_object().author:
+        author_id = self.get_queryset().filter(
+            pk=self.kwargs[self.pk_url_kwarg]
+        ).values_list('author_id', flat=True).first()
+        if author_id is None:
+            raise Http404
+        if author_id != request.user.id:
             return redirect('blog:post_detail',
                             self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
 
+def _freshness():
+    """
+    Возвращает короткий токен свежести ленты постов для ключей кеша.
+    Количество постов и последняя дата публикации снимаются одной
+    агрегатной выборкой (один запрос к БД вместо двух).
+    """
+    aggregate = Post.objects.aggregate(cnt=Count('pk'), latest=Max('pub_date'))
+    latest = aggregate['latest']
+    payload = '{}:{}'.format(
+        aggregate['cnt'], latest.timestamp() if latest else 0)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
 class PostListView(ListView):
     """Отображает главную страницу блога."""
 
     model = Post
     paginate_by = NUMBER_OF_POSTS
+    paginator_class = EstimatedPaginator
     template_name = 'blog/index.html'
 
+    def paginate_queryset(self, queryset, page_size):
+        page = self.request.GET.get(self.page_kwarg) or 1
+        key = 'blog:index:{}:{}:{}'.format(
+            cache.get(INDEX_CACHE_VERSION_KEY, 0),
+            page,
+            _freshness(),
+        )
+        cached = cache.get(key)
+        if cached is None:
+            cached = super().paginate_queryset(queryset, page_size)
+            cache.set(key, cached, INDEX_CACHE_TTL)
+        return cached
+
     def get_queryset(self):
-        return Post.objects.filter(
+        return Post.objects.select_related(
+            'category',
+            'location',
+            'author'
+        ).filter(
             pub_date__lte=timezone.now(),
             is_published=True,
             category__is_published=True,
-        ).annotate(comment_count=Count('comment')).order_by('-pub_date')
+        ).annotate(
+            text_preview=Substr('text', 1, POST_PREVIEW_LENGTH),
+        ).defer('text').order_by('-pub_date')
 
 
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
-    queryset = Post.objects.prefetch_related(
-        'category',
-        'location',
-        'author'
-    )
 
-    def dispatch(self, request, *args, **kwargs):
-        if (
-            request.user != self.get_object().author
-            and (self.get_object().is_published is False
-                 or self.get_object().category.is_published is False
-                 or self.get_object().pub_date > timezone.now())
-        ):
-            return HttpResponseNotFound('<h1>Страница не найдена</h1>')
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        return Post.objects.select_related(
+            'category',
+            'location',
+            'author'
+        ).prefetch_related(
+            Prefetch(
+                'comment',
+                queryset=Comment.objects.select_related(
+                    'author'
+                ).order_by('created_at'),
+                to_attr='cached_comments',
+            )
+        ).filter(
+            Q(author_id=self.request.user.id)
+            | Q(
+                is_published=True,
+                category__is_published=True,
+                pub_date__lte=timezone.now(),
+            )
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        context['form'] = CommentForm(initial={'post': post})
-        context['comments'] = Comment.objects.filter(post=post)
+        post = self.object
+        if self.request.user.is_authenticated:
+            context['form'] = CommentForm(initial={'post': post})
+        context['comments'] = post.cached_comments
         return context
 
 
-def category_posts(request, category_slug):
-    """Отображает категории постов"""
-    template = 'blog/category.html'
-    category = get_object_or_404(
-        Category, slug=category_slug, is_published=True)
-    post_list = category.posts.filter(
-        is_published=True,
-        pub_date__lte=timezone.now()
-    )
-    page_obj = paginate_page(request, post_list)
-    context = {'page_obj': page_obj, 'category': category}
-    return render(request, template, context)
+class CategoryListView(ListView):
+    """Отображает страницу категории постов."""
+
+    model = Post
+    paginate_by = NUMBER_OF_POSTS
+    paginator_class = PKPaginator
+    template_name = 'blog/category.html'
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.category = get_object_or_404(
+            Category, slug=kwargs['category_slug'], is_published=True)
+
+    def get_queryset(self):
+        return self.category.posts.select_related(
+            'category',
+            'location',
+            'author'
+        ).filter(
+            is_published=True,
+            pub_date__lte=timezone.now()
+        ).annotate(
+            text_preview=Substr('text', 1, POST_PREVIEW_LENGTH),
+        ).defer('text')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = self.category
+        return context
 
 
 class ProfileListView(ListView):
     model = Post
     paginate_by = NUMBER_OF_POSTS
+    paginator_class = EstimatedPaginator
     template_name = 'blog/profile.html'
 
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.profile = get_object_or_404(User, username=kwargs['username'])
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs['username']
-        )
+        context['profile'] = self.profile
         return context
 
     def get_queryset(self):
-        return Post.objects.filter(
-            author__username=self.kwargs['username']
-        ).annotate(comment_count=Count('comment')).order_by('-pub_date')
+        return Post.objects.select_related(
+            'category',
+            'location',
+            'author'
+        ).filter(
+            author_id=self.profile.id
+        ).annotate(
+            text_preview=Substr('text', 1, POST_PREVIEW_LENGTH),
+        ).defer('text').order_by('-pub_date')
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -161,10 +237,11 @@ def add_comment(request, post_id):
 
     form = CommentForm(request.POST or None)
     if form.is_valid():
-        comment = form.save(commit=False)
-        comment.post = post
-        comment.author = request.user
-        comment.save()
+        Comment.objects.create(
+            post=post,
+            author=request.user,
+            text=form.cleaned_data['text'],
+        )
     return redirect('blog:post_detail', post_id=post.id)
 
 
@@ -172,6 +249,12 @@ class CommentUpdateView(OnlyAuthorMixin, UpdateView):
     model = Comment
     fields = ('text',)
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
+
+    def form_valid(self, form):
+        self.object = form.save(commit=False)
+        self.object.save(update_fields=['text'])
+        return redirect(self.get_success_url())
 
     def get_success_url(self):
         return reverse_lazy(
@@ -179,17 +262,15 @@ class CommentUpdateView(OnlyAuthorMixin, UpdateView):
             kwargs={'post_id': self.object.post.id}
         )
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs['comment_id'],
-            post__id=self.kwargs['post_id']
-        )
+    def get_queryset(self):
+        return Comment.objects.select_related('post', 'author').filter(
+            post_id=self.kwargs['post_id'])
 
 
 class CommentDeleteView(OnlyAuthorMixin, DeleteView):
     model = Comment
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
 
     def get_success_url(self):
         return reverse_lazy(
@@ -197,9 +278,6 @@ class CommentDeleteView(OnlyAuthorMixin, DeleteView):
             kwargs={'post_id': self.object.post.id}
         )
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs['comment_id'],
-            post__id=self.kwargs['post_id']
-        )
+    def get_queryset(self):
+        return Comment.objects.select_related('post', 'author').filter(
+            post_id=self.kwargs['post_id'])